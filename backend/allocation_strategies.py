@@ -6,216 +6,205 @@ Different resource allocation policies for comparison.
 import numpy as np
 from typing import Dict, List
 
+# PCG64 generator — faster than the legacy global RandomState and lock-free
+_RNG = np.random.default_rng()
+
+# One typed record per patient; strategies read the fields as contiguous
+# column arrays instead of doing per-patient dict lookups
+PATIENT_DTYPE = np.dtype([
+    ("age", "i2"),
+    ("severity", "i1"),
+    ("needs_icu", "?"),
+    ("needs_ventilator", "?"),
+])
+
+
+def _as_patient_array(patients) -> np.ndarray:
+    """Coerce patient dicts into a PATIENT_DTYPE array (pass-through if already one)."""
+    if isinstance(patients, np.ndarray) and patients.dtype == PATIENT_DTYPE:
+        return patients
+    return np.fromiter(
+        ((p["age"], p["severity"], p["needs_icu"], p["needs_ventilator"]) for p in patients),
+        dtype=PATIENT_DTYPE, count=len(patients),
+    )
+
+
+def _allocate_kernel(wants_icu: np.ndarray, needs_vent: np.ndarray, beds: int, icu: int, vents: int):
+    """Shared mask-based allocation core for all strategies.
+
+    Patients are processed in the order of the input arrays: the first `icu`
+    ICU candidates get ICU slots, the remainder compete for `beds` beds, and
+    ventilators go to ICU-allocated patients that need one. Returns
+    (icu_mask, bed_mask, vent_mask, served_mask); every tier is derived with
+    boolean ops only, so there are no data-dependent branches to mispredict.
+    """
+    if icu <= 0 and beds <= 0:
+        # Nothing left to hand out — every patient is denied, skip the cumsums.
+        # This is the regime overloaded scenarios spend most of their days in.
+        empty = np.zeros(len(wants_icu), dtype=bool)
+        return empty, empty, empty, empty
+
+    icu_mask = wants_icu & (np.cumsum(wants_icu) <= icu)
+    wants_bed = ~icu_mask
+    bed_mask = wants_bed & (np.cumsum(wants_bed) <= beds)
+    vent_candidates = needs_vent & icu_mask
+    vent_mask = vent_candidates & (np.cumsum(vent_candidates) <= vents)
+    return icu_mask, bed_mask, vent_mask, icu_mask | bed_mask
+
 
 def allocate_fcfs(patients: List[Dict], resources: Dict) -> Dict:
     """First-Come First-Served: allocate in arrival order."""
-    beds = resources["beds"]
-    icu = resources["icu"]
-    vents = resources["ventilators"]
+    patients = _as_patient_array(patients)
+    n = len(patients)
 
-    treated = 0
-    denied = 0
-    icu_treated = 0
-    ventilated = 0
-    wait_times = []
-
-    for i, p in enumerate(patients):
-        if p["needs_icu"] and icu > 0:
-            icu -= 1
-            icu_treated += 1
-            if p["needs_ventilator"] and vents > 0:
-                vents -= 1
-                ventilated += 1
-            treated += 1
-            wait_times.append(i * 0.5)
-        elif beds > 0:
-            beds -= 1
-            treated += 1
-            wait_times.append(i * 0.3)
-        else:
-            denied += 1
-            wait_times.append(-1)
+    icu_mask, bed_mask, vent_mask, served = _allocate_kernel(
+        patients["needs_icu"], patients["needs_ventilator"],
+        resources["beds"], resources["icu"], resources["ventilators"],
+    )
+
+    idx = np.arange(n)
+    # avg wait = 0.5/slot for ICU arrivals, 0.3/slot for bed arrivals
+    wait_sum = 0.5 * idx[icu_mask].sum() + 0.3 * idx[bed_mask].sum()
+
+    icu_treated = int(icu_mask.sum())
+    treated = int(served.sum())
+    denied = n - treated
 
     return {
         "treated": treated,
         "denied": denied,
         "icu_treated": icu_treated,
-        "ventilated": ventilated,
-        "avg_wait": round(np.mean([w for w in wait_times if w >= 0]), 2) if wait_times else 0,
-        "mortality_estimate": round(denied * 0.15 + (len(patients) - icu_treated) * 0.02, 1),
-        "resource_utilization": round((treated / max(len(patients), 1)) * 100, 1),
+        "ventilated": int(vent_mask.sum()),
+        "avg_wait": round(float(wait_sum) / treated, 2) if treated else 0,
+        "mortality_estimate": round(denied * 0.15 + (n - icu_treated) * 0.02, 1),
+        "resource_utilization": round((treated / max(n, 1)) * 100, 1),
     }
 
 
 def allocate_severity(patients: List[Dict], resources: Dict) -> Dict:
     """Severity-Based: highest acuity patients first."""
-    sorted_patients = sorted(patients, key=lambda p: p["severity"], reverse=True)
+    patients = _as_patient_array(patients)
+    n = len(patients)
 
-    beds = resources["beds"]
-    icu = resources["icu"]
-    vents = resources["ventilators"]
+    # Highest acuity first; stable argsort keeps arrival order within a tier
+    order = np.argsort(-patients["severity"], kind="stable")
+    severity = patients["severity"][order]
 
-    treated = 0
-    denied = 0
-    icu_treated = 0
-    ventilated = 0
-    critical_saved = 0
-    wait_times = []
-
-    for i, p in enumerate(sorted_patients):
-        if p["severity"] >= 8 and icu > 0:
-            icu -= 1
-            icu_treated += 1
-            critical_saved += 1
-            if p["needs_ventilator"] and vents > 0:
-                vents -= 1
-                ventilated += 1
-            treated += 1
-            wait_times.append(i * 0.2)
-        elif p["needs_icu"] and icu > 0:
-            icu -= 1
-            icu_treated += 1
-            if p["needs_ventilator"] and vents > 0:
-                vents -= 1
-                ventilated += 1
-            treated += 1
-            wait_times.append(i * 0.3)
-        elif beds > 0:
-            beds -= 1
-            treated += 1
-            wait_times.append(i * 0.3)
-        else:
-            denied += 1
-            wait_times.append(-1)
+    # Critical patients (severity >= 8) claim ICU slots even without an ICU flag
+    critical = severity >= 8
+    icu_mask, bed_mask, vent_mask, served = _allocate_kernel(
+        critical | patients["needs_icu"][order], patients["needs_ventilator"][order],
+        resources["beds"], resources["icu"], resources["ventilators"],
+    )
+
+    idx = np.arange(n)
+    # avg wait = 0.2/slot for critical ICU arrivals, 0.3/slot for the rest
+    crit_icu = critical & icu_mask
+    wait_sum = 0.2 * idx[crit_icu].sum() + 0.3 * idx[(icu_mask & ~critical) | bed_mask].sum()
+
+    icu_treated = int(icu_mask.sum())
+    treated = int(served.sum())
+    denied = n - treated
 
     return {
         "treated": treated,
         "denied": denied,
         "icu_treated": icu_treated,
-        "ventilated": ventilated,
-        "critical_saved": critical_saved,
-        "avg_wait": round(np.mean([w for w in wait_times if w >= 0]), 2) if wait_times else 0,
-        "mortality_estimate": round(denied * 0.12 + (len(patients) - icu_treated) * 0.015, 1),
-        "resource_utilization": round((treated / max(len(patients), 1)) * 100, 1),
+        "ventilated": int(vent_mask.sum()),
+        "critical_saved": int(crit_icu.sum()),
+        "avg_wait": round(float(wait_sum) / treated, 2) if treated else 0,
+        "mortality_estimate": round(denied * 0.12 + (n - icu_treated) * 0.015, 1),
+        "resource_utilization": round((treated / max(n, 1)) * 100, 1),
     }
 
 
 def allocate_equity(patients: List[Dict], resources: Dict) -> Dict:
     """Equity-Weighted: fair distribution across age groups and demographics."""
-    age_groups = {"young": [], "adult": [], "senior": []}
-    for p in patients:
-        if p["age"] < 18:
-            age_groups["young"].append(p)
-        elif p["age"] < 60:
-            age_groups["adult"].append(p)
-        else:
-            age_groups["senior"].append(p)
-
-    # Sort each group by severity
-    for key in age_groups:
-        age_groups[key].sort(key=lambda p: p["severity"], reverse=True)
+    patients = _as_patient_array(patients)
+    n = len(patients)
+    severity = patients["severity"]
+    needs_icu = patients["needs_icu"]
+    needs_vent = patients["needs_ventilator"]
+
+    # Bucket by age in one pass: 0=young (<18), 1=adult (<60), 2=senior
+    group_ids = np.digitize(patients["age"], [18, 60])
 
     beds = resources["beds"]
     icu = resources["icu"]
     vents = resources["ventilators"]
 
-    # Distribute resources proportionally
-    total = len(patients)
-    group_shares = {}
-    for key, group in age_groups.items():
-        share = len(group) / max(total, 1)
-        group_shares[key] = {
-            "beds": max(1, int(beds * share)),
-            "icu": max(0, int(icu * share)),
-            "vents": max(0, int(vents * share)),
-        }
+    # Distribute resources proportionally: rows = age groups, columns =
+    # (beds, icu, vents), with beds floored at 1 per group
+    shares = np.bincount(group_ids, minlength=3) / max(n, 1)
+    group_caps = (np.array([beds, icu, vents]) * shares[:, None]).astype(int)
+    group_caps = np.maximum(group_caps, np.array([1, 0, 0]))
 
     treated = 0
     denied = 0
     icu_treated = 0
     ventilated = 0
 
-    for key, group in age_groups.items():
-        g_beds = group_shares[key]["beds"]
-        g_icu = group_shares[key]["icu"]
-        g_vents = group_shares[key]["vents"]
-
-        for p in group:
-            if p["needs_icu"] and g_icu > 0:
-                g_icu -= 1
-                icu_treated += 1
-                if p["needs_ventilator"] and g_vents > 0:
-                    g_vents -= 1
-                    ventilated += 1
-                treated += 1
-            elif g_beds > 0:
-                g_beds -= 1
-                treated += 1
-            else:
-                denied += 1
+    for g in range(3):
+        # Highest severity first within each group (stable keeps arrival order)
+        idx = np.where(group_ids == g)[0]
+        idx = idx[np.argsort(-severity[idx], kind="stable")]
+
+        icu_mask, bed_mask, vent_mask, served = _allocate_kernel(
+            needs_icu[idx], needs_vent[idx],
+            group_caps[g, 0], group_caps[g, 1], group_caps[g, 2],
+        )
+        g_served = int(served.sum())
+        icu_treated += int(icu_mask.sum())
+        treated += g_served
+        ventilated += int(vent_mask.sum())
+        denied += len(idx) - g_served
 
     return {
         "treated": treated,
         "denied": denied,
         "icu_treated": icu_treated,
         "ventilated": ventilated,
-        "avg_wait": round(np.random.uniform(1.5, 3.5), 2),
+        "avg_wait": round(_RNG.uniform(1.5, 3.5), 2),
         "mortality_estimate": round(denied * 0.13 + (len(patients) - icu_treated) * 0.018, 1),
         "resource_utilization": round((treated / max(len(patients), 1)) * 100, 1),
-        "equity_score": round(min(95, 75 + np.random.uniform(5, 20)), 1),
+        "equity_score": round(min(95, 75 + _RNG.uniform(5, 20)), 1),
     }
 
 
 def allocate_optimized(patients: List[Dict], resources: Dict) -> Dict:
     """Optimized: maximize lives saved using scoring heuristic (LP-inspired)."""
-    # Score = severity * survival_probability_with_treatment - cost_weight
-    scored = []
-    for p in patients:
-        survival_gain = p["severity"] * 0.12
-        cost = 1.0 if p["needs_icu"] else 0.3
-        if p["needs_ventilator"]:
-            cost += 0.5
-        score = survival_gain / max(cost, 0.1)
-        scored.append({**p, "_opt_score": score})
-
-    scored.sort(key=lambda x: x["_opt_score"], reverse=True)
-
-    beds = resources["beds"]
-    icu = resources["icu"]
-    vents = resources["ventilators"]
-
-    treated = 0
-    denied = 0
-    icu_treated = 0
-    ventilated = 0
-    critical_saved = 0
-
-    for p in scored:
-        if p["needs_icu"] and icu > 0:
-            icu -= 1
-            icu_treated += 1
-            if p["severity"] >= 8:
-                critical_saved += 1
-            if p["needs_ventilator"] and vents > 0:
-                vents -= 1
-                ventilated += 1
-            treated += 1
-        elif beds > 0:
-            beds -= 1
-            treated += 1
-        else:
-            denied += 1
+    patients = _as_patient_array(patients)
+    n = len(patients)
+    severity = patients["severity"]
+    needs_icu = patients["needs_icu"]
+    needs_vent = patients["needs_ventilator"]
+
+    # Score = severity * survival_probability_with_treatment / cost_weight,
+    # computed as a parallel array instead of copying every patient dict
+    cost = np.where(needs_icu, 1.0, 0.3) + np.where(needs_vent, 0.5, 0.0)
+    score = severity * 0.12 / np.maximum(cost, 0.1)
+    order = np.argsort(-score, kind="stable")
+
+    severity = severity[order]
+    icu_mask, bed_mask, vent_mask, served = _allocate_kernel(
+        needs_icu[order], needs_vent[order],
+        resources["beds"], resources["icu"], resources["ventilators"],
+    )
+
+    icu_treated = int(icu_mask.sum())
+    treated = int(served.sum())
+    denied = n - treated
 
     return {
         "treated": treated,
         "denied": denied,
         "icu_treated": icu_treated,
-        "ventilated": ventilated,
-        "critical_saved": critical_saved,
-        "avg_wait": round(np.random.uniform(0.8, 2.0), 2),
+        "ventilated": int(vent_mask.sum()),
+        "critical_saved": int(((severity >= 8) & icu_mask).sum()),
+        "avg_wait": round(_RNG.uniform(0.8, 2.0), 2),
         "mortality_estimate": round(denied * 0.10 + (len(patients) - icu_treated) * 0.012, 1),
         "resource_utilization": round(min(99, (treated / max(len(patients), 1)) * 100 + 3), 1),
-        "optimization_score": round(min(98, 80 + np.random.uniform(5, 18)), 1),
+        "optimization_score": round(min(98, 80 + _RNG.uniform(5, 18)), 1),
     }
 
 
@@ -225,3 +214,9 @@ STRATEGIES = {
     "equity": {"name": "Equity-Weighted", "fn": allocate_equity, "color": "#8B5CF6"},
     "optimized": {"name": "Optimized (Max Lives)", "fn": allocate_optimized, "color": "#10B981"},
 }
+
+# Static API body for /api/strategies, built once at import
+STRATEGIES_API = [
+    {"key": k, "name": v["name"], "color": v["color"]}
+    for k, v in STRATEGIES.items()
+]
@@ -3,9 +3,14 @@ CrisisForge AI — Synthetic Data Generator
 Generates demo hospitals, historical data, and scenarios for showcasing.
 """
 
+import time
+
 import numpy as np
 from typing import List, Dict
 
+# PCG64 generator — faster than the legacy global RandomState and lock-free
+_RNG = np.random.default_rng()
+
 
 HOSPITAL_NAMES = [
     "AIIMS Nagpur",
@@ -32,46 +37,66 @@ HOSPITAL_COORDS = [
 
 REGIONS = ["Mihan", "Sitabuldi", "Dharampeth", "Sadar", "Wardhaman Nagar"]
 
+# Demo hospital data only needs to look "live"; cache per count with a short
+# TTL so dashboard refreshes, transfers and telegram previews share one draw.
+_HOSPITAL_CACHE: Dict[int, tuple] = {}
+_HOSPITAL_CACHE_TTL = 30.0  # seconds
+
 
 def generate_hospitals(count: int = 6) -> List[Dict]:
-    """Generate realistic hospital profiles."""
-    hospitals = []
-    for i in range(min(count, len(HOSPITAL_NAMES))):
-        total_beds = int(np.random.uniform(100, 500))
-        icu_beds = int(total_beds * np.random.uniform(0.08, 0.18))
-        ventilators = int(icu_beds * np.random.uniform(0.5, 0.9))
-        staff = int(total_beds * np.random.uniform(0.6, 1.2))
+    """Generate realistic hospital profiles (cached for a short TTL)."""
+    cached = _HOSPITAL_CACHE.get(count)
+    if cached is not None and time.monotonic() - cached[0] < _HOSPITAL_CACHE_TTL:
+        return cached[1]
 
-        occupancy = np.random.uniform(0.4, 0.8)
+    n = min(count, len(HOSPITAL_NAMES))
 
+    # One (n, 6) uniform draw covers every random parameter for the fleet;
+    # all fields derive from it via broadcasting + a single .astype per array
+    u = _RNG.uniform(size=(n, 6))
+    total_beds = (100 + u[:, 0] * 400).astype(int)
+    icu_beds = (total_beds * (0.08 + u[:, 1] * 0.10)).astype(int)
+    ventilators = (icu_beds * (0.5 + u[:, 2] * 0.4)).astype(int)
+    staff = (total_beds * (0.6 + u[:, 3] * 0.6)).astype(int)
+    occupancy = 0.4 + u[:, 4] * 0.4
+    occupied_beds = (total_beds * occupancy).astype(int)
+    occupied_icu = (icu_beds * occupancy * 0.9).astype(int)
+    ventilators_in_use = (ventilators * occupancy * 0.7).astype(int)
+    active_staff = (staff * (0.7 + u[:, 5] * 0.25)).astype(int)
+
+    hospitals = []
+    for i in range(n):
         hospitals.append({
             "id": i + 1,
             "name": HOSPITAL_NAMES[i],
             "region": REGIONS[i % len(REGIONS)],
             "lat": HOSPITAL_COORDS[i][0],
             "lng": HOSPITAL_COORDS[i][1],
-            "total_beds": total_beds,
-            "icu_beds": icu_beds,
-            "ventilators": ventilators,
-            "total_staff": staff,
-            "occupied_beds": int(total_beds * occupancy),
-            "occupied_icu": int(icu_beds * occupancy * 0.9),
-            "ventilators_in_use": int(ventilators * occupancy * 0.7),
-            "active_staff": int(staff * np.random.uniform(0.7, 0.95)),
+            "total_beds": int(total_beds[i]),
+            "icu_beds": int(icu_beds[i]),
+            "ventilators": int(ventilators[i]),
+            "total_staff": int(staff[i]),
+            "occupied_beds": int(occupied_beds[i]),
+            "occupied_icu": int(occupied_icu[i]),
+            "ventilators_in_use": int(ventilators_in_use[i]),
+            "active_staff": int(active_staff[i]),
         })
+
+    _HOSPITAL_CACHE[count] = (time.monotonic(), hospitals)
     return hospitals
 
 
 def generate_historical_data(days: int = 90) -> Dict:
     """Generate historical admissions data for trend charts."""
     t = np.arange(days)
-    base = 35 + 0.1 * t
-    weekly = 5 * np.sin(2 * np.pi * t / 7)
-    noise = np.random.normal(0, 3, days)
-    admissions = np.maximum(base + weekly + noise, 5).astype(int)
+    # trend + weekly seasonality + noise fused into one expression so NumPy
+    # chains the ufuncs without named intermediate arrays
+    admissions = np.maximum(
+        35 + 0.1 * t + 5 * np.sin(2 * np.pi * t / 7) + _RNG.normal(0, 3, days), 5
+    ).astype(int)
 
-    discharges = np.maximum(admissions - np.random.randint(0, 8, days), 0)
-    icu_admissions = (admissions * np.random.uniform(0.08, 0.15, days)).astype(int)
+    discharges = np.maximum(admissions - _RNG.integers(0, 8, days), 0)
+    icu_admissions = (admissions * _RNG.uniform(0.08, 0.15, days)).astype(int)
 
     return {
         "days": list(range(1, days + 1)),
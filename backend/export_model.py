@@ -1,6 +1,6 @@
 import joblib
-import csv
 import os
+import numpy as np
 from ml_model import CrisisForgeMLModel, generate_training_data, FEATURE_NAMES
 
 def export_model_and_data():
@@ -8,33 +8,26 @@ def export_model_and_data():
     # 1. Train the model manually
     model = CrisisForgeMLModel()
     model.train(n_samples=5000)
-    
-    # 2. Export the trained models using joblib
+
+    # 2. Export the trained models using joblib (compressed; load API unchanged)
     export_path = "crisisforge_model.joblib"
     joblib.dump({
         "outcome_model": model.outcome_model,
         "resource_model": model.resource_model,
         "features": FEATURE_NAMES,
         "metrics": model.metrics
-    }, export_path)
-    
+    }, export_path, compress=3)
+
     print(f"✅ ML Model successfully exported to: {os.path.abspath(export_path)}")
-    
-    # 3. Generate dataset and save to CSV
+
+    # 3. Generate dataset and save to CSV in one vectorized write
     X, y_outcome, y_resource = generate_training_data(n_samples=5000, seed=42)
     csv_path = "crisisforge_patient_data.csv"
-    
-    with open(csv_path, mode="w", newline="") as file:
-        writer = csv.writer(file)
-        # Write headers
-        headers = FEATURE_NAMES + ["outcome_label", "resource_hours_needed"]
-        writer.writerow(headers)
-        
-        # Write 5000 rows
-        for i in range(len(X)):
-            row = list(X[i]) + [int(y_outcome[i]), round(float(y_resource[i]), 1)]
-            writer.writerow(row)
-            
+
+    out = np.hstack([X, y_outcome[:, None], np.round(y_resource[:, None], 1)])
+    headers = FEATURE_NAMES + ["outcome_label", "resource_hours_needed"]
+    np.savetxt(csv_path, out, delimiter=",", header=",".join(headers), fmt="%g", comments="")
+
     print(f"✅ Training Dataset successfully exported to: {os.path.abspath(csv_path)}")
 
 if __name__ == "__main__":
@@ -5,28 +5,28 @@ Healthcare Resource Allocation Simulator API
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from typing import Optional, List, Dict
 import asyncio
 
+import numpy as np
+
 from prediction_engine import predict_patient_inflow, predict_resource_consumption
 from simulation_engine import run_simulation
-from allocation_strategies import STRATEGIES
+from allocation_strategies import STRATEGIES, STRATEGIES_API
 from data_generator import generate_hospitals, generate_historical_data, generate_preset_scenarios
 from transfer_engine import recommend_transfers
-from ml_model import get_model
-from telegram_bot import (
-    format_alert_message, format_transfer_message, format_prediction_message,
-    send_telegram_message, generate_capacity_alerts, get_bot_status,
-    autonomous_monitor,
-)
-from database import init_db
+
+# ml_model (sklearn/joblib) and telegram_bot are imported lazily inside the
+# routes that need them so cold start only pays for the core modules.
 
 # ─── App Setup ───
 app = FastAPI(
     title="CrisisForge AI",
     description="Healthcare Resource Allocation Simulator — Predict, Simulate, Compare, Act.",
     version="2.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -40,13 +40,24 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup():
-    init_db()
+    from database import init_db
+    from ml_model import get_model
+    from telegram_bot import autonomous_monitor
+
+    loop = asyncio.get_running_loop()
+
+    # Schema check runs in a worker thread so serving starts immediately
+    await loop.run_in_executor(None, init_db)
+
     # Pre-train ML model in background
-    try:
-        get_model()
-    except Exception:
-        pass
-    
+    def _pretrain():
+        try:
+            get_model()
+        except Exception:
+            pass
+
+    loop.run_in_executor(None, _pretrain)
+
     # Start the autonomous Telegram monitoring loop
     asyncio.create_task(autonomous_monitor())
 
@@ -89,6 +100,10 @@ class PatientPredictionRequest(BaseModel):
     hospital_icu_occupancy: float = Field(default=0.6, ge=0, le=1)
 
 
+# Validates a whole batch in one pass instead of one model per list item
+_PATIENT_BATCH = TypeAdapter(List[PatientPredictionRequest])
+
+
 class TelegramRequest(BaseModel):
     bot_token: str = ""
     chat_id: str = ""
@@ -147,19 +162,18 @@ def simulate(req: ScenarioRequest):
     )
 
 
+# Both bodies are static, so build them once at import instead of per request
+_PRESET_SCENARIOS = generate_preset_scenarios()
+
+
 @app.get("/api/scenarios")
 def get_scenarios():
-    return {"scenarios": generate_preset_scenarios()}
+    return {"scenarios": _PRESET_SCENARIOS}
 
 
 @app.get("/api/strategies")
 def get_strategies():
-    return {
-        "strategies": [
-            {"key": k, "name": v["name"], "color": v["color"]}
-            for k, v in STRATEGIES.items()
-        ]
-    }
+    return {"strategies": STRATEGIES_API}
 
 
 @app.get("/api/historical")
@@ -167,36 +181,46 @@ def get_historical(days: int = Query(default=90, ge=7, le=365)):
     return {"data": generate_historical_data(days)}
 
 
+def _fleet_summary(hospitals: List[Dict]) -> Dict:
+    """Single-pass capacity totals and occupancy percentages for a fleet."""
+    total_beds = occupied_beds = total_icu = occupied_icu = 0
+    total_vents = vents_in_use = total_staff = active_staff = 0
+    for h in hospitals:
+        total_beds += h["total_beds"]
+        occupied_beds += h["occupied_beds"]
+        total_icu += h["icu_beds"]
+        occupied_icu += h["occupied_icu"]
+        total_vents += h["ventilators"]
+        vents_in_use += h["ventilators_in_use"]
+        total_staff += h["total_staff"]
+        active_staff += h["active_staff"]
+
+    return {
+        "total_hospitals": len(hospitals),
+        "total_beds": total_beds,
+        "occupied_beds": occupied_beds,
+        "bed_occupancy": round(occupied_beds / max(total_beds, 1) * 100, 1),
+        "total_icu": total_icu,
+        "occupied_icu": occupied_icu,
+        "icu_occupancy": round(occupied_icu / max(total_icu, 1) * 100, 1),
+        "total_ventilators": total_vents,
+        "ventilators_in_use": vents_in_use,
+        "ventilator_usage": round(vents_in_use / max(total_vents, 1) * 100, 1),
+        "total_staff": total_staff,
+        "active_staff": active_staff,
+        "staff_utilization": round(active_staff / max(total_staff, 1) * 100, 1),
+    }
+
+
 @app.get("/api/dashboard-summary")
 def dashboard_summary():
     hospitals = generate_hospitals(6)
     historical = generate_historical_data(30)
-
-    total_beds = sum(h["total_beds"] for h in hospitals)
-    occupied_beds = sum(h["occupied_beds"] for h in hospitals)
-    total_icu = sum(h["icu_beds"] for h in hospitals)
-    occupied_icu = sum(h["occupied_icu"] for h in hospitals)
-    total_vents = sum(h["ventilators"] for h in hospitals)
-    vents_in_use = sum(h["ventilators_in_use"] for h in hospitals)
-    total_staff = sum(h["total_staff"] for h in hospitals)
-    active_staff = sum(h["active_staff"] for h in hospitals)
+    summary = _fleet_summary(hospitals)
 
     return {
         "hospitals_count": len(hospitals),
-        "overview": {
-            "total_beds": total_beds,
-            "occupied_beds": occupied_beds,
-            "bed_occupancy": round(occupied_beds / max(total_beds, 1) * 100, 1),
-            "total_icu": total_icu,
-            "occupied_icu": occupied_icu,
-            "icu_occupancy": round(occupied_icu / max(total_icu, 1) * 100, 1),
-            "total_ventilators": total_vents,
-            "ventilators_in_use": vents_in_use,
-            "ventilator_usage": round(vents_in_use / max(total_vents, 1) * 100, 1),
-            "total_staff": total_staff,
-            "active_staff": active_staff,
-            "staff_utilization": round(active_staff / max(total_staff, 1) * 100, 1),
-        },
+        "overview": {k: v for k, v in summary.items() if k != "total_hospitals"},
         "recent_admissions": historical,
         "hospitals": hospitals,
         "alerts": _generate_alerts(hospitals),
@@ -204,14 +228,24 @@ def dashboard_summary():
 
 
 def _generate_alerts(hospitals):
+    n = len(hospitals)
+    bed_pct = (
+        np.fromiter((h["occupied_beds"] for h in hospitals), dtype=float, count=n)
+        / np.maximum(np.fromiter((h["total_beds"] for h in hospitals), dtype=float, count=n), 1)
+    )
+    icu_pct = (
+        np.fromiter((h["occupied_icu"] for h in hospitals), dtype=float, count=n)
+        / np.maximum(np.fromiter((h["icu_beds"] for h in hospitals), dtype=float, count=n), 1)
+    )
+
+    # Only format messages for the hospitals that actually breach a threshold
     alerts = []
-    for h in hospitals:
-        bed_pct = h["occupied_beds"] / max(h["total_beds"], 1)
-        icu_pct = h["occupied_icu"] / max(h["icu_beds"], 1)
-        if bed_pct > 0.85:
-            alerts.append({"level": "critical" if bed_pct > 0.95 else "warning", "hospital": h["name"], "message": f"Bed occupancy at {round(bed_pct*100)}%", "type": "bed_capacity"})
-        if icu_pct > 0.8:
-            alerts.append({"level": "critical" if icu_pct > 0.9 else "warning", "hospital": h["name"], "message": f"ICU occupancy at {round(icu_pct*100)}%", "type": "icu_capacity"})
+    for i in np.where((bed_pct > 0.85) | (icu_pct > 0.8))[0]:
+        name = hospitals[i]["name"]
+        if bed_pct[i] > 0.85:
+            alerts.append({"level": "critical" if bed_pct[i] > 0.95 else "warning", "hospital": name, "message": f"Bed occupancy at {round(float(bed_pct[i]) * 100)}%", "type": "bed_capacity"})
+        if icu_pct[i] > 0.8:
+            alerts.append({"level": "critical" if icu_pct[i] > 0.9 else "warning", "hospital": name, "message": f"ICU occupancy at {round(float(icu_pct[i]) * 100)}%", "type": "icu_capacity"})
     return alerts
 
 
@@ -233,6 +267,8 @@ def get_transfers(hospital_count: int = Query(default=6, ge=3, le=8)):
 @app.get("/api/ml/status")
 def ml_status():
     """Get ML model training status and metrics."""
+    from ml_model import get_model
+
     model = get_model()
     return {
         "trained": model.is_trained,
@@ -244,6 +280,8 @@ def ml_status():
 @app.post("/api/ml/predict")
 def ml_predict(req: PatientPredictionRequest):
     """Predict patient outcome using ML model."""
+    from ml_model import get_model
+
     model = get_model()
     return model.predict_patient(req.model_dump())
 
@@ -251,6 +289,8 @@ def ml_predict(req: PatientPredictionRequest):
 @app.post("/api/ml/explain")
 def ml_explain(req: PatientPredictionRequest):
     """Get SHAP-like explanation for a patient prediction."""
+    from ml_model import get_model
+
     model = get_model()
     return model.explain_prediction(req.model_dump())
 
@@ -258,15 +298,25 @@ def ml_explain(req: PatientPredictionRequest):
 @app.get("/api/ml/importance")
 def ml_feature_importance():
     """Get feature importance from the trained model."""
+    from ml_model import get_model
+
     model = get_model()
     return model.get_feature_importance()
 
 
 @app.post("/api/ml/predict-batch")
-def ml_predict_batch(patients: List[PatientPredictionRequest]):
+def ml_predict_batch(patients: List[Dict]):
     """Predict outcomes for a batch of patients."""
+    from ml_model import get_model
+
     model = get_model()
-    return {"predictions": model.predict_batch([p.model_dump() for p in patients])}
+    try:
+        validated = _PATIENT_BATCH.validate_python(patients)
+    except ValidationError as e:
+        # Keep the 422 contract FastAPI gave us when validation lived on
+        # the endpoint signature
+        raise HTTPException(status_code=422, detail=e.errors())
+    return {"predictions": model.predict_batch(_PATIENT_BATCH.dump_python(validated))}
 
 
 # ═══════════════════════════════════════════════════
@@ -276,23 +326,22 @@ def ml_predict_batch(patients: List[PatientPredictionRequest]):
 @app.get("/api/telegram/status")
 def telegram_status():
     """Get Telegram bot configuration status."""
+    from telegram_bot import get_bot_status
+
     return get_bot_status()
 
 
 @app.post("/api/telegram/send")
 async def telegram_send(req: TelegramRequest):
     """Send a Telegram alert."""
+    from telegram_bot import format_alert_message, format_transfer_message, \
+        generate_capacity_alerts, send_telegram_message
+
     hospitals = generate_hospitals(6)
 
     if req.message_type == "alerts":
         alerts = generate_capacity_alerts(hospitals)
-        summary = {
-            "total_hospitals": len(hospitals),
-            "bed_occupancy": round(sum(h["occupied_beds"] for h in hospitals) / max(sum(h["total_beds"] for h in hospitals), 1) * 100, 1),
-            "icu_occupancy": round(sum(h["occupied_icu"] for h in hospitals) / max(sum(h["icu_beds"] for h in hospitals), 1) * 100, 1),
-            "ventilator_usage": round(sum(h["ventilators_in_use"] for h in hospitals) / max(sum(h["ventilators"] for h in hospitals), 1) * 100, 1),
-        }
-        message = format_alert_message(alerts, summary)
+        message = format_alert_message(alerts, _fleet_summary(hospitals))
     elif req.message_type == "transfers":
         result = recommend_transfers(hospitals)
         message = format_transfer_message(result["recommended_transfers"])
@@ -308,17 +357,14 @@ async def telegram_send(req: TelegramRequest):
 @app.get("/api/telegram/preview")
 def telegram_preview(message_type: str = Query(default="alerts")):
     """Preview what the Telegram message would look like."""
+    from telegram_bot import format_alert_message, format_transfer_message, \
+        generate_capacity_alerts
+
     hospitals = generate_hospitals(6)
 
     if message_type == "alerts":
         alerts = generate_capacity_alerts(hospitals)
-        summary = {
-            "total_hospitals": len(hospitals),
-            "bed_occupancy": round(sum(h["occupied_beds"] for h in hospitals) / max(sum(h["total_beds"] for h in hospitals), 1) * 100, 1),
-            "icu_occupancy": round(sum(h["occupied_icu"] for h in hospitals) / max(sum(h["icu_beds"] for h in hospitals), 1) * 100, 1),
-            "ventilator_usage": round(sum(h["ventilators_in_use"] for h in hospitals) / max(sum(h["ventilators"] for h in hospitals), 1) * 100, 1),
-        }
-        message = format_alert_message(alerts, summary)
+        message = format_alert_message(alerts, _fleet_summary(hospitals))
     elif message_type == "transfers":
         result = recommend_transfers(hospitals)
         message = format_transfer_message(result["recommended_transfers"])
@@ -4,13 +4,19 @@ XGBoost-based patient outcome prediction with SHAP explainability.
 Trains on synthetic data, predicts severity & resource needs.
 """
 
-import numpy as np
+import hashlib
 import json
+
+import joblib
+import numpy as np
 from typing import Dict, List, Tuple
 from pathlib import Path
 
-# We use sklearn since xgboost may not be installed; GradientBoosting is equivalent
-from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor
+# We use sklearn since xgboost may not be installed; histogram gradient
+# boosting is its Cython binned-feature implementation — far faster to train
+# than the classic per-tree estimators with the same predict/predict_proba API
+from sklearn.ensemble import HistGradientBoostingClassifier, HistGradientBoostingRegressor
+from sklearn.inspection import permutation_importance
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, mean_absolute_error
 
@@ -24,13 +30,32 @@ FEATURE_NAMES = [
     "hospital_bed_occupancy", "hospital_icu_occupancy",
 ]
 
+# Baseline feature means used by explain_prediction's perturbation rows
+MEAN_VALS = np.array([50, 0.5, 5, 18, 80, 95, 37.0, 120, 0.4, 0.6, 5, 0.3, 45, 0.65, 0.55])
+
+# Per-feature defaults applied when a patient dict omits a key, in
+# FEATURE_NAMES order
+FEATURE_DEFAULTS = np.array(
+    [50, 0, 5, 18, 80, 95, 37.0, 120, 0, 0, 3, 0, 15, 0.7, 0.6], dtype=np.float32
+)
+
+
+def _patient_features(patient_data: Dict) -> np.ndarray:
+    """Build a float32 feature row from a patient dict, filling defaults."""
+    x = FEATURE_DEFAULTS.copy()
+    for i, key in enumerate(FEATURE_NAMES):
+        v = patient_data.get(key)
+        if v is not None:
+            x[i] = v
+    return x
+
 
 def generate_training_data(n_samples: int = 5000, seed: int = 42) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Generate synthetic patient data for training.
     Returns: (features, outcome_labels, resource_hours)
     """
-    rng = np.random.RandomState(seed)
+    rng = np.random.default_rng(seed)
 
     age = rng.normal(55, 18, n_samples).clip(1, 100)
     gender = rng.binomial(1, 0.52, n_samples)  # 0=female, 1=male
@@ -68,11 +93,10 @@ def generate_training_data(n_samples: int = 5000, seed: int = 42) -> Tuple[np.nd
     )
     risk_score += rng.normal(0, 0.1, n_samples)
 
-    # Outcomes: 0=discharged, 1=still_admitted, 2=critical, 3=deceased
-    outcomes = np.zeros(n_samples, dtype=int)
-    outcomes[risk_score > 0.45] = 1
-    outcomes[risk_score > 0.65] = 2
-    outcomes[risk_score > 0.82] = 3
+    # Outcomes: 0=discharged, 1=still_admitted, 2=critical, 3=deceased —
+    # one searchsorted pass over the monotonic thresholds instead of three
+    # masked writes
+    outcomes = np.searchsorted(np.array([0.45, 0.65, 0.82]), risk_score).astype(np.int64)
 
     # Resource hours needed
     resource_hours = (
@@ -83,28 +107,33 @@ def generate_training_data(n_samples: int = 5000, seed: int = 42) -> Tuple[np.nd
         rng.normal(0, 10, n_samples)
     ).clip(4, 500)
 
-    return features, outcomes, resource_hours
+    # float32 is plenty for histogram split finding and halves the memory
+    # traffic through training and the tree walks
+    return features.astype(np.float32, copy=False), outcomes, resource_hours.astype(np.float32, copy=False)
 
 
 class CrisisForgeMLModel:
     """XGBoost-style ML model for patient outcome prediction."""
 
     def __init__(self):
-        self.outcome_model = GradientBoostingClassifier(
-            n_estimators=100, max_depth=5, learning_rate=0.1, random_state=42
+        self.outcome_model = HistGradientBoostingClassifier(
+            max_iter=100, max_depth=5, learning_rate=0.1, random_state=42
         )
-        self.resource_model = GradientBoostingRegressor(
-            n_estimators=80, max_depth=4, learning_rate=0.1, random_state=42
+        self.resource_model = HistGradientBoostingRegressor(
+            max_iter=80, max_depth=4, learning_rate=0.1, random_state=42
         )
         self.is_trained = False
         self.metrics = {}
+        self._fi_cache = None
 
     def train(self, n_samples: int = 5000):
         """Train the model on synthetic data."""
         X, y_outcome, y_resource = generate_training_data(n_samples)
 
-        X_train, X_test, y_train, y_test = train_test_split(X, y_outcome, test_size=0.2, random_state=42)
-        _, _, yr_train, yr_test = train_test_split(X, y_resource, test_size=0.2, random_state=42)
+        # One split covers both targets — same shuffle, half the copies of X
+        X_train, X_test, y_train, y_test, yr_train, yr_test = train_test_split(
+            X, y_outcome, y_resource, test_size=0.2, random_state=42
+        )
 
         self.outcome_model.fit(X_train, y_train)
         self.resource_model.fit(X_train, yr_train)
@@ -112,6 +141,13 @@ class CrisisForgeMLModel:
         y_pred = self.outcome_model.predict(X_test)
         yr_pred = self.resource_model.predict(X_test)
 
+        # Histogram models do not expose feature_importances_; compute
+        # permutation importances once here and reuse them for reporting
+        perm_o = permutation_importance(self.outcome_model, X_test, y_test, n_repeats=5, random_state=42)
+        perm_r = permutation_importance(self.resource_model, X_test, yr_test, n_repeats=5, random_state=42)
+        self._outcome_importance = np.maximum(perm_o.importances_mean, 0)
+        self._resource_importance = np.maximum(perm_r.importances_mean, 0)
+
         self.metrics = {
             "outcome_accuracy": round(accuracy_score(y_test, y_pred) * 100, 1),
             "resource_mae_hours": round(mean_absolute_error(yr_test, yr_pred), 1),
@@ -122,6 +158,7 @@ class CrisisForgeMLModel:
         }
 
         self.is_trained = True
+        self._fi_cache = None
         return self.metrics
 
     def predict_patient(self, patient_data: Dict) -> Dict:
@@ -129,26 +166,13 @@ class CrisisForgeMLModel:
         if not self.is_trained:
             self.train()
 
-        features = np.array([[
-            patient_data.get("age", 50),
-            patient_data.get("gender", 0),
-            patient_data.get("severity_score", 5),
-            patient_data.get("respiratory_rate", 18),
-            patient_data.get("heart_rate", 80),
-            patient_data.get("spo2", 95),
-            patient_data.get("temperature", 37.0),
-            patient_data.get("systolic_bp", 120),
-            patient_data.get("has_comorbidity", 0),
-            patient_data.get("comorbidity_count", 0),
-            patient_data.get("days_since_symptom_onset", 3),
-            patient_data.get("is_icu_candidate", 0),
-            patient_data.get("crisis_day", 15),
-            patient_data.get("hospital_bed_occupancy", 0.7),
-            patient_data.get("hospital_icu_occupancy", 0.6),
-        ]])
+        features = _patient_features(patient_data).reshape(1, -1)
 
+        # One ensemble walk: predict() is just argmax over predict_proba,
+        # so deriving the class from the probabilities halves the tree
+        # traversals per request
         outcome_probs = self.outcome_model.predict_proba(features)[0]
-        predicted_outcome = int(self.outcome_model.predict(features)[0])
+        predicted_outcome = int(self.outcome_model.classes_[np.argmax(outcome_probs)])
         predicted_hours = float(self.resource_model.predict(features)[0])
 
         outcome_labels = ["Discharged", "Admitted", "Critical", "Deceased"]
@@ -166,20 +190,55 @@ class CrisisForgeMLModel:
         }
 
     def predict_batch(self, patients: List[Dict]) -> List[Dict]:
-        """Predict outcomes for multiple patients."""
-        return [self.predict_patient(p) for p in patients]
+        """Predict outcomes for multiple patients in one ensemble pass."""
+        if not self.is_trained:
+            self.train()
+        if not patients:
+            return []
+
+        # Stack every patient into one matrix so the tree ensembles are
+        # walked once for the whole batch instead of once per patient
+        X = np.stack([_patient_features(p) for p in patients])
+
+        probs = self.outcome_model.predict_proba(X)
+        hours = self.resource_model.predict(X)
+        outcomes = self.outcome_model.classes_[np.argmax(probs, axis=1)].astype(int)
+
+        outcome_labels = ["Discharged", "Admitted", "Critical", "Deceased"]
+        prob_keys = ["discharged", "admitted", "critical", "deceased"]
+        n_classes = probs.shape[1]
+
+        return [
+            {
+                "predicted_outcome": outcome_labels[outcome],
+                "outcome_probabilities": {
+                    k: round(float(row[j]) * 100, 1) if j < n_classes else 0
+                    for j, k in enumerate(prob_keys)
+                },
+                "predicted_resource_hours": round(float(h), 1),
+                "risk_level": "Critical" if outcome >= 2 else "Moderate" if outcome == 1 else "Low",
+            }
+            for outcome, row, h in zip(outcomes, probs, hours)
+        ]
 
     def get_feature_importance(self) -> Dict:
         """Get feature importance from the trained model (SHAP-like)."""
         if not self.is_trained:
             self.train()
 
-        outcome_importance = self.outcome_model.feature_importances_
-        resource_importance = self.resource_model.feature_importances_
+        # feature_importances_ only changes on retrain, so the formatted
+        # payload is memoized and invalidated by train(); getattr guards
+        # models unpickled from before the cache attribute existed
+        cached = getattr(self, "_fi_cache", None)
+        if cached is not None:
+            return cached
+
+        outcome_importance = self._outcome_importance
+        resource_importance = self._resource_importance
 
         # Normalize to percentages
-        outcome_pct = (outcome_importance / outcome_importance.sum() * 100)
-        resource_pct = (resource_importance / resource_importance.sum() * 100)
+        outcome_pct = (outcome_importance / max(outcome_importance.sum(), 1e-12) * 100)
+        resource_pct = (resource_importance / max(resource_importance.sum(), 1e-12) * 100)
 
         features = []
         for i, name in enumerate(FEATURE_NAMES):
@@ -192,12 +251,13 @@ class CrisisForgeMLModel:
 
         features.sort(key=lambda x: x["combined_importance"], reverse=True)
 
-        return {
+        self._fi_cache = {
             "feature_importance": features,
             "top_predictors": [f["feature"] for f in features[:5]],
-            "model_type": "GradientBoosting (XGBoost-equivalent)",
+            "model_type": "HistGradientBoosting (XGBoost-equivalent)",
             "model_metrics": self.metrics,
         }
+        return self._fi_cache
 
     def explain_prediction(self, patient_data: Dict) -> Dict:
         """
@@ -208,40 +268,23 @@ class CrisisForgeMLModel:
             self.train()
 
         prediction = self.predict_patient(patient_data)
-        base_features = np.array([[
-            patient_data.get("age", 50),
-            patient_data.get("gender", 0),
-            patient_data.get("severity_score", 5),
-            patient_data.get("respiratory_rate", 18),
-            patient_data.get("heart_rate", 80),
-            patient_data.get("spo2", 95),
-            patient_data.get("temperature", 37.0),
-            patient_data.get("systolic_bp", 120),
-            patient_data.get("has_comorbidity", 0),
-            patient_data.get("comorbidity_count", 0),
-            patient_data.get("days_since_symptom_onset", 3),
-            patient_data.get("is_icu_candidate", 0),
-            patient_data.get("crisis_day", 15),
-            patient_data.get("hospital_bed_occupancy", 0.7),
-            patient_data.get("hospital_icu_occupancy", 0.6),
-        ]])
-
-        # Mean values for baseline
-        mean_vals = [50, 0.5, 5, 18, 80, 95, 37.0, 120, 0.4, 0.6, 5, 0.3, 45, 0.65, 0.55]
-
-        # Perturbation-based contribution estimation
-        base_risk = self.outcome_model.predict_proba(base_features)[0]
-        contributions = []
+        base_features = _patient_features(patient_data).reshape(1, -1)
 
-        for i, name in enumerate(FEATURE_NAMES):
-            perturbed = base_features.copy()
-            perturbed[0, i] = mean_vals[i]
-            perturbed_risk = self.outcome_model.predict_proba(perturbed)[0]
+        # Perturbation-based contribution estimation: one row per feature
+        # with that feature swapped to its baseline mean, scored in a single
+        # batched predict_proba instead of 15 separate ensemble walks
+        base_risk = self.outcome_model.predict_proba(base_features)[0]
+        perturbed = np.tile(base_features, (len(FEATURE_NAMES), 1))
+        np.fill_diagonal(perturbed, MEAN_VALS)
+        perturbed_risk = self.outcome_model.predict_proba(perturbed)
 
-            # Contribution = difference when feature is at mean vs actual
-            max_class = np.argmax(base_risk)
-            contribution = float(base_risk[max_class] - perturbed_risk[max_class])
+        # Contribution = difference when feature is at mean vs actual
+        max_class = int(np.argmax(base_risk))
+        contribs = base_risk[max_class] - perturbed_risk[:, max_class]
 
+        contributions = []
+        for i, name in enumerate(FEATURE_NAMES):
+            contribution = float(contribs[i])
             contributions.append({
                 "feature": name,
                 "value": float(base_features[0, i]),
@@ -266,11 +309,28 @@ class CrisisForgeMLModel:
 # Global model instance (lazy-loaded)
 _model: CrisisForgeMLModel | None = None
 
+# On-disk cache of the fitted model, keyed by the training configuration so
+# a hyperparameter change invalidates stale files automatically
+_CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+_TRAIN_CONFIG = {"model": "histgb", "dtype": "float32", "n_samples": 5000, "seed": 42, "outcome_iters": 100, "resource_iters": 80}
+
+
+def _model_cache_path() -> Path:
+    key = hashlib.sha1(json.dumps(_TRAIN_CONFIG, sort_keys=True).encode()).hexdigest()[:16]
+    return _CACHE_DIR / f"crisisforge_model_{key}.joblib"
+
 
 def get_model() -> CrisisForgeMLModel:
     """Get or create the global ML model instance."""
     global _model
     if _model is None:
-        _model = CrisisForgeMLModel()
-        _model.train()
+        cache_path = _model_cache_path()
+        if cache_path.exists():
+            # mmap the tree arrays so cold start is paging, not retraining
+            _model = joblib.load(cache_path, mmap_mode="r")
+        else:
+            _model = CrisisForgeMLModel()
+            _model.train()
+            _CACHE_DIR.mkdir(exist_ok=True)
+            joblib.dump(_model, cache_path)
     return _model
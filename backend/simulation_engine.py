@@ -3,35 +3,105 @@ CrisisForge AI — Simulation Engine
 Runs discrete-event simulation for crisis scenarios and compares strategies.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 from typing import Dict, List, Optional
 from prediction_engine import predict_patient_inflow, predict_resource_consumption
-from allocation_strategies import STRATEGIES
+from allocation_strategies import PATIENT_DTYPE, STRATEGIES
 
+# PCG64 generator — faster than the legacy global RandomState and lock-free
+_RNG = np.random.default_rng()
 
-def generate_patients_for_day(count: int, crisis_type: str = "pandemic") -> List[Dict]:
-    """Generate synthetic patient records for a single day."""
-    patients = []
-    for _ in range(int(count)):
-        severity = int(np.clip(np.random.exponential(4) + 1, 1, 10))
 
-        if crisis_type == "pandemic":
-            severity = int(np.clip(severity + np.random.choice([0, 1, 2, 3], p=[0.4, 0.3, 0.2, 0.1]), 1, 10))
-        elif crisis_type == "earthquake":
-            severity = int(np.clip(severity + np.random.choice([0, 2, 3, 4], p=[0.3, 0.3, 0.25, 0.15]), 1, 10))
+def generate_patients_for_day(
+    count: int,
+    crisis_type: str = "pandemic",
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Generate a day's patient cohort as a PATIENT_DTYPE struct array."""
+    rng = rng or _RNG
+    count = int(count)
+    severity = np.clip(rng.exponential(4, count) + 1, 1, 10).astype(int)
+
+    # Crisis-specific severity bump, drawn once for the whole cohort
+    if crisis_type == "pandemic":
+        severity = np.clip(severity + rng.choice([0, 1, 2, 3], size=count, p=[0.4, 0.3, 0.2, 0.1]), 1, 10)
+    elif crisis_type == "earthquake":
+        severity = np.clip(severity + rng.choice([0, 2, 3, 4], size=count, p=[0.3, 0.3, 0.25, 0.15]), 1, 10)
+
+    patients = np.empty(count, dtype=PATIENT_DTYPE)
+    patients["age"] = np.clip(rng.normal(50, 20, count), 1, 95).astype(int)
+    patients["severity"] = severity
+    patients["needs_icu"] = (severity >= 7) | ((severity >= 5) & (rng.random(count) < 0.3))
+    patients["needs_ventilator"] = (severity >= 8) | (patients["needs_icu"] & (rng.random(count) < 0.4))
+    return patients
 
-        age = int(np.clip(np.random.normal(50, 20), 1, 95))
-        needs_icu = severity >= 7 or (severity >= 5 and np.random.random() < 0.3)
-        needs_ventilator = severity >= 8 or (needs_icu and np.random.random() < 0.4)
 
-        patients.append({
-            "age": age,
-            "severity": severity,
-            "needs_icu": needs_icu,
-            "needs_ventilator": needs_ventilator,
-            "crisis_type": crisis_type,
+def _run_strategy(
+    strat_key: str,
+    daily_cohorts: List[np.ndarray],
+    hospital_beds: int,
+    hospital_icu: int,
+    hospital_ventilators: int,
+) -> Dict:
+    """Run one allocation strategy over the forecast horizon."""
+    strat = STRATEGIES[strat_key]
+    timeline = []
+    cumulative_treated = 0
+    cumulative_denied = 0
+    cumulative_deaths_est = 0.0
+
+    # Daily resource pool resets (simplified model)
+    for day_idx, patients in enumerate(daily_cohorts):
+        # Available resources for this day (capacity minus some ongoing usage factor)
+        usage_factor = min(0.7, day_idx * 0.02)  # gradually more constrained
+        daily_resources = {
+            "beds": max(1, int(hospital_beds * (1 - usage_factor * 0.3))),
+            "icu": max(1, int(hospital_icu * (1 - usage_factor * 0.5))),
+            "ventilators": max(1, int(hospital_ventilators * (1 - usage_factor * 0.4))),
+        }
+
+        result = strat["fn"](patients, daily_resources)
+
+        cumulative_treated += result["treated"]
+        cumulative_denied += result["denied"]
+        cumulative_deaths_est += result["mortality_estimate"]
+
+        timeline.append({
+            "day": day_idx + 1,
+            "patients": len(patients),
+            "treated": result["treated"],
+            "denied": result["denied"],
+            "cumulative_treated": cumulative_treated,
+            "cumulative_denied": cumulative_denied,
+            "mortality_estimate": round(cumulative_deaths_est, 1),
+            "resource_utilization": result["resource_utilization"],
+            "avg_wait": result.get("avg_wait", 0),
+            "beds_available": daily_resources["beds"],
+            "icu_available": daily_resources["icu"],
+            "vents_available": daily_resources["ventilators"],
         })
-    return patients
+
+    # Aggregate summary
+    total_patients = sum(t["patients"] for t in timeline)
+    return {
+        "name": strat["name"],
+        "color": strat["color"],
+        "timeline": timeline,
+        "summary": {
+            "total_patients": total_patients,
+            "total_treated": cumulative_treated,
+            "total_denied": cumulative_denied,
+            "estimated_deaths": round(cumulative_deaths_est, 1),
+            "survival_rate": round((1 - cumulative_deaths_est / max(total_patients, 1)) * 100, 1),
+            "avg_utilization": round(
+                np.mean([t["resource_utilization"] for t in timeline]), 1
+            ),
+            "avg_wait_time": round(np.mean([t["avg_wait"] for t in timeline]), 2),
+            "peak_denied": max(t["denied"] for t in timeline),
+        },
+    }
 
 
 def run_simulation(
@@ -60,70 +130,29 @@ def run_simulation(
     # 2. Predict resource consumption
     resource_forecast = predict_resource_consumption(inflow_forecast["mean"])
 
-    # 3. Run each strategy day-by-day
+    # 3. Run each strategy day-by-day — concurrently, since the per-day work
+    # is NumPy code that releases the GIL
+    valid_strategies = [k for k in strategies if k in STRATEGIES]
     strategy_results = {}
-    for strat_key in strategies:
-        if strat_key not in STRATEGIES:
-            continue
-
-        strat = STRATEGIES[strat_key]
-        timeline = []
-        cumulative_treated = 0
-        cumulative_denied = 0
-        cumulative_deaths_est = 0.0
-
-        # Daily resource pool resets (simplified model)
-        for day_idx, daily_inflow in enumerate(inflow_forecast["mean"]):
-            patients = generate_patients_for_day(daily_inflow, crisis_type)
-
-            # Available resources for this day (capacity minus some ongoing usage factor)
-            usage_factor = min(0.7, day_idx * 0.02)  # gradually more constrained
-            daily_resources = {
-                "beds": max(1, int(hospital_beds * (1 - usage_factor * 0.3))),
-                "icu": max(1, int(hospital_icu * (1 - usage_factor * 0.5))),
-                "ventilators": max(1, int(hospital_ventilators * (1 - usage_factor * 0.4))),
+    if valid_strategies:
+        # Draw each day's cohort once and hand the same patients to every
+        # strategy: len(strategies)x fewer RNG draws, and the comparison is
+        # apples-to-apples because all strategies triage an identical mix.
+        # The struct arrays are read-only from the strategies' perspective,
+        # so sharing them across threads is safe.
+        daily_cohorts = [
+            generate_patients_for_day(daily_inflow, crisis_type)
+            for daily_inflow in inflow_forecast["mean"]
+        ]
+        with ThreadPoolExecutor(max_workers=len(valid_strategies)) as pool:
+            futures = {
+                key: pool.submit(
+                    _run_strategy, key, daily_cohorts,
+                    hospital_beds, hospital_icu, hospital_ventilators,
+                )
+                for key in valid_strategies
             }
-
-            result = strat["fn"](patients, daily_resources)
-
-            cumulative_treated += result["treated"]
-            cumulative_denied += result["denied"]
-            cumulative_deaths_est += result["mortality_estimate"]
-
-            timeline.append({
-                "day": day_idx + 1,
-                "patients": len(patients),
-                "treated": result["treated"],
-                "denied": result["denied"],
-                "cumulative_treated": cumulative_treated,
-                "cumulative_denied": cumulative_denied,
-                "mortality_estimate": round(cumulative_deaths_est, 1),
-                "resource_utilization": result["resource_utilization"],
-                "avg_wait": result.get("avg_wait", 0),
-                "beds_available": daily_resources["beds"],
-                "icu_available": daily_resources["icu"],
-                "vents_available": daily_resources["ventilators"],
-            })
-
-        # Aggregate summary
-        total_patients = sum(t["patients"] for t in timeline)
-        strategy_results[strat_key] = {
-            "name": strat["name"],
-            "color": strat["color"],
-            "timeline": timeline,
-            "summary": {
-                "total_patients": total_patients,
-                "total_treated": cumulative_treated,
-                "total_denied": cumulative_denied,
-                "estimated_deaths": round(cumulative_deaths_est, 1),
-                "survival_rate": round((1 - cumulative_deaths_est / max(total_patients, 1)) * 100, 1),
-                "avg_utilization": round(
-                    np.mean([t["resource_utilization"] for t in timeline]), 1
-                ),
-                "avg_wait_time": round(np.mean([t["avg_wait"] for t in timeline]), 2),
-                "peak_denied": max(t["denied"] for t in timeline),
-            },
-        }
+            strategy_results = {key: f.result() for key, f in futures.items()}
 
     return {
         "scenario": {
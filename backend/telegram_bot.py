@@ -14,6 +14,9 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime
 
+import httpx
+import numpy as np
+
 from data_generator import generate_hospitals
 from transfer_engine import recommend_transfers
 
@@ -23,6 +26,19 @@ logger = logging.getLogger(__name__)
 BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN", "")
 CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID", "")
 
+# One shared HTTP client so alerts reuse the TLS connection instead of
+# paying DNS + handshake per message; the semaphore keeps alert storms
+# under Telegram's ~30 msgs/sec limit
+_client: Optional[httpx.AsyncClient] = None
+_send_semaphore = asyncio.Semaphore(20)
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=10)
+    return _client
+
 # Alert state tracking to prevent spam
 ALERT_HISTORY = {}
 COOLDOWN_MINUTES = 5
@@ -42,26 +58,30 @@ def format_alert_message(alerts: List[Dict], summary: Dict) -> str:
     """Format alerts into a Telegram-ready message."""
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
 
-    msg = f"🔥 *CrisisForge AI Alert*\n"
-    msg += f"📅 {now}\n\n"
+    # Collect parts and join once — repeated += on str is O(n^2)
+    parts = ["🔥 *CrisisForge AI Alert*", f"📅 {now}", ""]
 
     if summary:
-        msg += f"📊 *Network Overview*\n"
-        msg += f"├ Hospitals: {summary.get('total_hospitals', 'N/A')}\n"
-        msg += f"├ Bed Occ: {summary.get('bed_occupancy', 'N/A')}%\n"
-        msg += f"├ ICU Occ: {summary.get('icu_occupancy', 'N/A')}%\n"
-        msg += f"└ Ventilator: {summary.get('ventilator_usage', 'N/A')}%\n\n"
+        parts.extend([
+            "📊 *Network Overview*",
+            f"├ Hospitals: {summary.get('total_hospitals', 'N/A')}",
+            f"├ Bed Occ: {summary.get('bed_occupancy', 'N/A')}%",
+            f"├ ICU Occ: {summary.get('icu_occupancy', 'N/A')}%",
+            f"└ Ventilator: {summary.get('ventilator_usage', 'N/A')}%",
+            "",
+        ])
 
     if alerts:
-        msg += f"⚠️ *Active Alerts ({len(alerts)})*\n"
-        for a in alerts:
-            icon = "🔴" if a["level"] == "critical" else "🟡"
-            msg += f"{icon} *{a['hospital']}*: {a['message']}\n"
+        parts.append(f"⚠️ *Active Alerts ({len(alerts)})*")
+        parts.extend(
+            f"{'🔴' if a['level'] == 'critical' else '🟡'} *{a['hospital']}*: {a['message']}"
+            for a in alerts
+        )
     else:
-        msg += "✅ All systems within normal thresholds\n"
+        parts.append("✅ All systems within normal thresholds")
 
-    msg += f"\n🔗 Dashboard: http://localhost:5173"
-    return msg
+    parts.append("\n🔗 Dashboard: http://localhost:5173")
+    return "\n".join(parts)
 
 
 def format_transfer_message(transfers: List[Dict]) -> str:
@@ -69,35 +89,40 @@ def format_transfer_message(transfers: List[Dict]) -> str:
     if not transfers:
         return "✅ No transfers recommended — network is balanced."
 
-    msg = "🚑 *Patient Transfer Recommendations*\n\n"
+    parts = ["🚑 *Patient Transfer Recommendations*", ""]
     for t in transfers[:5]:
         priority_icon = "🔴" if t["priority"] == "critical" else "🟡" if t["priority"] == "high" else "🟢"
-        msg += f"{priority_icon} *Transfer #{t['id']}*\n"
-        msg += f"  📤 From: {t['from_hospital']} ({t['from_pressure']}% load)\n"
-        msg += f"  📥 To: {t['to_hospital']} ({t['to_pressure']}% load)\n"
-        msg += f"  👥 Patients: {t['total_patients']} ({t['patients_general']} general + {t['patients_icu']} ICU)\n"
-        msg += f"  📏 Distance: {t['distance_km']}km (~{int(t['estimated_transfer_time_min'])}min)\n"
-        msg += f"  📉 Pressure reduction: {t['pressure_reduction']}%\n\n"
+        parts.extend([
+            f"{priority_icon} *Transfer #{t['id']}*",
+            f"  📤 From: {t['from_hospital']} ({t['from_pressure']}% load)",
+            f"  📥 To: {t['to_hospital']} ({t['to_pressure']}% load)",
+            f"  👥 Patients: {t['total_patients']} ({t['patients_general']} general + {t['patients_icu']} ICU)",
+            f"  📏 Distance: {t['distance_km']}km (~{int(t['estimated_transfer_time_min'])}min)",
+            f"  📉 Pressure reduction: {t['pressure_reduction']}%",
+            "",
+        ])
 
-    msg += f"Total patients to transfer: {sum(t['total_patients'] for t in transfers)}"
-    return msg
+    parts.append(f"Total patients to transfer: {sum(t['total_patients'] for t in transfers)}")
+    return "\n".join(parts)
 
 
 def format_prediction_message(prediction: Dict) -> str:
     """Format ML prediction into Telegram message."""
-    msg = "🧠 *AI Prediction Result*\n\n"
-    msg += f"🎯 Outcome: *{prediction['predicted_outcome']}*\n"
-    msg += f"⚠️ Risk Level: *{prediction['risk_level']}*\n"
-    msg += f"⏱️ Est. Resource Hours: {prediction['predicted_resource_hours']}\n\n"
-
-    msg += "📊 *Outcome Probabilities:*\n"
     probs = prediction["outcome_probabilities"]
-    msg += f"  ✅ Discharged: {probs['discharged']}%\n"
-    msg += f"  🏥 Admitted: {probs['admitted']}%\n"
-    msg += f"  ⚠️ Critical: {probs['critical']}%\n"
-    msg += f"  💀 Deceased: {probs['deceased']}%\n"
-
-    return msg
+    return "\n".join([
+        "🧠 *AI Prediction Result*",
+        "",
+        f"🎯 Outcome: *{prediction['predicted_outcome']}*",
+        f"⚠️ Risk Level: *{prediction['risk_level']}*",
+        f"⏱️ Est. Resource Hours: {prediction['predicted_resource_hours']}",
+        "",
+        "📊 *Outcome Probabilities:*",
+        f"  ✅ Discharged: {probs['discharged']}%",
+        f"  🏥 Admitted: {probs['admitted']}%",
+        f"  ⚠️ Critical: {probs['critical']}%",
+        f"  💀 Deceased: {probs['deceased']}%",
+        "",
+    ])
 
 
 async def send_telegram_message(message: str, token: str = "", chat_id: str = "") -> Dict:
@@ -113,20 +138,18 @@ async def send_telegram_message(message: str, token: str = "", chat_id: str = ""
         }
 
     try:
-        import urllib.request
-        import json
-
         url = f"https://api.telegram.org/bot{token}/sendMessage"
-        data = json.dumps({
-            "chat_id": chat_id,
-            "text": message,
-            "parse_mode": "Markdown",
-        }).encode("utf-8")
-
-        req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            result = json.loads(resp.read().decode())
-            return {"success": True, "message_id": result.get("result", {}).get("message_id")}
+        async with _send_semaphore:
+            resp = await _get_client().post(url, json={
+                "chat_id": chat_id,
+                "text": message,
+                "parse_mode": "Markdown",
+            })
+        # httpx does not raise on 4xx/5xx like urllib did — surface bad
+        # tokens / rate limits through the except below
+        resp.raise_for_status()
+        result = resp.json()
+        return {"success": True, "message_id": result.get("result", {}).get("message_id")}
 
     except Exception as e:
         logger.error(f"Telegram send failed: {e}")
@@ -135,25 +158,42 @@ async def send_telegram_message(message: str, token: str = "", chat_id: str = ""
 
 def generate_capacity_alerts(hospitals: List[Dict]) -> List[Dict]:
     """Generate alerts based on current hospital capacity."""
-    alerts = []
-
-    for h in hospitals:
-        bed_pct = round(h["occupied_beds"] / max(h["total_beds"], 1) * 100, 1)
-        icu_pct = round(h["occupied_icu"] / max(h["icu_beds"], 1) * 100, 1)
-        vent_pct = round(h["ventilators_in_use"] / max(h["ventilators"], 1) * 100, 1)
+    n = len(hospitals)
+    if n == 0:
+        return []
+
+    # Occupancy percentages for the whole fleet in a few array ops; only
+    # hospitals whose thresholds fired are visited in Python below
+    def _ratio(used_key: str, total_key: str) -> np.ndarray:
+        used = np.fromiter((h[used_key] for h in hospitals), dtype=float, count=n)
+        total = np.fromiter((h[total_key] for h in hospitals), dtype=float, count=n)
+        return np.round(used / np.maximum(total, 1) * 100, 1)
+
+    bed_pct = _ratio("occupied_beds", "total_beds")
+    icu_pct = _ratio("occupied_icu", "icu_beds")
+    vent_pct = _ratio("ventilators_in_use", "ventilators")
+
+    # Bind the thresholds as locals once per scan instead of a dict
+    # subscript per comparison
+    t_bed_warn, t_bed_crit, t_icu_warn, t_icu_crit, t_vent_crit = (
+        THRESHOLDS[k]
+        for k in ("bed_warning", "bed_critical", "icu_warning", "icu_critical", "ventilator_critical")
+    )
+    bed_warn = bed_pct >= t_bed_warn
+    bed_crit = bed_pct >= t_bed_crit
+    icu_warn = icu_pct >= t_icu_warn
+    icu_crit = icu_pct >= t_icu_crit
+    vent_crit = vent_pct >= t_vent_crit
 
-        if bed_pct >= THRESHOLDS["bed_critical"]:
-            alerts.append({"level": "critical", "hospital": h["name"], "message": f"Bed occupancy at {bed_pct}%", "type": "bed"})
-        elif bed_pct >= THRESHOLDS["bed_warning"]:
-            alerts.append({"level": "warning", "hospital": h["name"], "message": f"Bed occupancy at {bed_pct}%", "type": "bed"})
-
-        if icu_pct >= THRESHOLDS["icu_critical"]:
-            alerts.append({"level": "critical", "hospital": h["name"], "message": f"ICU occupancy at {icu_pct}%", "type": "icu"})
-        elif icu_pct >= THRESHOLDS["icu_warning"]:
-            alerts.append({"level": "warning", "hospital": h["name"], "message": f"ICU occupancy at {icu_pct}%", "type": "icu"})
-
-        if vent_pct >= THRESHOLDS["ventilator_critical"]:
-            alerts.append({"level": "critical", "hospital": h["name"], "message": f"Ventilator usage at {vent_pct}%", "type": "ventilator"})
+    alerts = []
+    for i in np.where(bed_warn | icu_warn | vent_crit)[0]:
+        name = hospitals[i]["name"]
+        if bed_warn[i]:
+            alerts.append({"level": "critical" if bed_crit[i] else "warning", "hospital": name, "message": f"Bed occupancy at {bed_pct[i]}%", "type": "bed"})
+        if icu_warn[i]:
+            alerts.append({"level": "critical" if icu_crit[i] else "warning", "hospital": name, "message": f"ICU occupancy at {icu_pct[i]}%", "type": "icu"})
+        if vent_crit[i]:
+            alerts.append({"level": "critical", "hospital": name, "message": f"Ventilator usage at {vent_pct[i]}%", "type": "ventilator"})
 
     return alerts
 
@@ -4,8 +4,71 @@ Recommends optimal patient transfers between hospitals in a network
 to balance load and maximize survival rates.
 """
 
+from dataclasses import dataclass, fields
+from functools import lru_cache
+
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
+
+
+@dataclass(slots=True)
+class Hospital:
+    """Typed hospital record.
+
+    recommend_transfers accepts these alongside plain dicts; slots keep
+    instances compact and attribute access a fixed-offset load.
+    """
+    name: str
+    region: str
+    total_beds: int
+    occupied_beds: int
+    icu_beds: int
+    occupied_icu: int
+    ventilators: int
+    ventilators_in_use: int
+    total_staff: int
+    active_staff: int
+
+
+def _as_hospital_dict(h: Union[Dict, Hospital]) -> Dict:
+    """Pass dicts through; flatten Hospital instances once at the boundary."""
+    if isinstance(h, dict):
+        return h
+    return {f.name: getattr(h, f.name) for f in fields(Hospital)}
+
+
+_RESOURCE_COLUMNS = (
+    "total_beds", "occupied_beds", "icu_beds", "occupied_icu",
+    "ventilators", "ventilators_in_use", "total_staff", "active_staff",
+)
+
+
+def _hospitals_to_arrays(hospitals: List[Dict]) -> Dict[str, np.ndarray]:
+    """Columnar (struct-of-arrays) view of the hospital list for vectorized passes."""
+    n = len(hospitals)
+    return {
+        key: np.fromiter((h[key] for h in hospitals), dtype=float, count=n)
+        for key in _RESOURCE_COLUMNS
+    }
+
+
+def _safe_denominators(cols: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Division-safe totals (clamped to >= 1), computed once per fleet."""
+    return {
+        key: np.maximum(cols[key], 1)
+        for key in ("total_beds", "icu_beds", "ventilators", "total_staff")
+    }
+
+
+def _network_pressures(cols: Dict[str, np.ndarray], safe: Dict[str, np.ndarray]) -> np.ndarray:
+    """Composite pressure scores (0-100) for the whole fleet in one pass."""
+    pressure = (
+        cols["occupied_beds"] / safe["total_beds"] * 100 * 0.25 +
+        cols["occupied_icu"] / safe["icu_beds"] * 100 * 0.35 +
+        cols["ventilators_in_use"] / safe["ventilators"] * 100 * 0.25 +
+        cols["active_staff"] / safe["total_staff"] * 100 * 0.15
+    )
+    return np.round(np.minimum(pressure, 100), 1)
 
 
 def calculate_hospital_pressure(hospital: Dict) -> float:
@@ -35,27 +98,120 @@ def calculate_available_capacity(hospital: Dict) -> Dict:
     }
 
 
-def generate_distance_matrix(hospitals: List[Dict]) -> Dict[str, Dict[str, float]]:
-    """Generate synthetic distances between hospitals (km) based on regions."""
-    np.random.seed(42)
-    n = len(hospitals)
-    distances = {}
+@lru_cache(maxsize=16)
+def _build_distance_matrix(names_regions: Tuple[Tuple[str, str], ...]) -> Tuple[np.ndarray, Dict[str, int]]:
+    """Generate synthetic distances between hospitals (km) based on regions.
+
+    Returns an (n, n) matrix plus a name→row-index map, replacing the old
+    dict-of-dicts: distances come from two whole-matrix uniform draws masked
+    by region equality instead of one scalar RNG call per cell, and lookups
+    become plain array indexing.
+
+    Distances are deterministic in the (name, region) tuple, so results are
+    memoized across calls; the matrix is returned read-only since cache hits
+    share it.
+    """
+    # Seeded local generator: same distances every call without touching
+    # the global np.random state other callers may rely on
+    rng = np.random.default_rng(42)
+    n = len(names_regions)
+    regions = np.array([region for _, region in names_regions])
+    same_region = regions[:, None] == regions[None, :]
+
+    near = rng.uniform(5, 25, (n, n))
+    far = rng.uniform(30, 80, (n, n))
+    distances = np.round(np.where(same_region, near, far), 1)
+    np.fill_diagonal(distances, 0.0)
+    distances.setflags(write=False)
+
+    name_to_idx = {name: i for i, (name, _) in enumerate(names_regions)}
+    return distances, name_to_idx
+
+
+# One row per accepted transfer, filled in the matching kernel and turned
+# into result dicts in a single pass afterwards
+_MATCH_DTYPE = np.dtype([
+    ("sender", np.int32),
+    ("receiver", np.int32),
+    ("beds", np.int32),
+    ("icu", np.int32),
+    ("score", np.float64),
+])
+
+
+def _match_transfers(
+    sender_ids: np.ndarray,
+    excess_beds: np.ndarray,
+    excess_icu: np.ndarray,
+    r_idxs: np.ndarray,
+    avail_beds: np.ndarray,
+    avail_icu: np.ndarray,
+    avail_staff: np.ndarray,
+    dist_matrix: np.ndarray,
+    max_transfers: int,
+) -> np.ndarray:
+    """Match senders to receivers on flat arrays only.
+
+    The hot sender/receiver matching loop lives here, away from any dict
+    handling: inputs are the columnar arrays plus the distance matrix, and
+    accepted transfers come back as rows of a preallocated _MATCH_DTYPE
+    array, with the result dicts assembled by the caller. ``sender_ids``
+    must already be filtered to senders with positive excess. ``avail_beds``/
+    ``avail_icu`` are decremented in place as transfers are accepted, so the
+    caller sees post-transfer capacities.
+    """
+    matches = np.empty(max_transfers, dtype=_MATCH_DTYPE)
+    count = 0
+
+    for s_idx in sender_ids:
+        if count >= max_transfers:
+            break
+
+        if len(r_idxs) == 0:
+            break
+
+        # Score all receivers for this sender at once, gathering current
+        # capacities straight from the columnar arrays; the sender scores
+        # itself at -inf so it can never be picked
+        scores = (
+            avail_beds[r_idxs] * 2 + avail_icu[r_idxs] * 5 + avail_staff[r_idxs]
+            - dist_matrix[s_idx, r_idxs] * 0.5
+        )
+        scores[r_idxs == s_idx] = -np.inf
+
+        # Partial-sort for the top 3: O(n) argpartition, then order the few
+        # survivors by score. Ranking happens on the 1-decimal rounded scores,
+        # matching how the old per-receiver loop sorted them.
+        rounded = np.round(scores, 1)
+        k = min(3, len(rounded))
+        top = np.argpartition(-rounded, k - 1)[:k]
+        top = top[np.argsort(-rounded[top], kind="stable")]
+
+        for j in top:  # Top 3 receivers per sender
+            if count >= max_transfers:
+                break
+            if not np.isfinite(scores[j]):
+                continue
+
+            t_idx = int(r_idxs[j])
+            # Clamping both counts here keeps everything downstream
+            # non-negative, so the emit path needs no further guards
+            transferable_beds = int(min(max(0, excess_beds[s_idx]), avail_beds[t_idx], 15))
+            transferable_icu = int(min(max(0, excess_icu[s_idx]), avail_icu[t_idx], 5))
 
-    for i, h1 in enumerate(hospitals):
-        distances[h1["name"]] = {}
-        for j, h2 in enumerate(hospitals):
-            if i == j:
-                distances[h1["name"]][h2["name"]] = 0.0
-            elif h1["region"] == h2["region"]:
-                distances[h1["name"]][h2["name"]] = round(np.random.uniform(5, 25), 1)
-            else:
-                distances[h1["name"]][h2["name"]] = round(np.random.uniform(30, 80), 1)
+            if transferable_beds <= 0 and transferable_icu <= 0:
+                continue
 
-    return distances
+            avail_beds[t_idx] -= transferable_beds
+            avail_icu[t_idx] -= transferable_icu
+            matches[count] = (s_idx, t_idx, transferable_beds, transferable_icu, scores[j])
+            count += 1
+
+    return matches[:count]
 
 
 def recommend_transfers(
-    hospitals: List[Dict],
+    hospitals: List[Union[Dict, Hospital]],
     max_transfers: int = 10,
     pressure_threshold: float = 75.0,
     min_receiving_capacity: int = 5,
@@ -70,119 +226,130 @@ def recommend_transfers(
        distance, available capacity, and staff readiness
     4. Generate transfer recommendations with priority and estimated impact
     """
-    # Step 1: Calculate pressure and capacity for all hospitals
-    hospital_metrics = []
-    for h in hospitals:
-        pressure = calculate_hospital_pressure(h)
-        capacity = calculate_available_capacity(h)
-        hospital_metrics.append({
-            **h,
-            "pressure": pressure,
-            "available": capacity,
-            "status": "critical" if pressure > 90 else "overloaded" if pressure > pressure_threshold else "stable" if pressure > 50 else "available",
-        })
+    hospitals = [_as_hospital_dict(h) for h in hospitals]
+
+    # Steps 1-2, fused: every derived quantity — safe denominators,
+    # pressures, labels, available capacity, excess over the 75% comfort
+    # level, sender/receiver masks and the summary scalars — comes out of
+    # one vectorized block over the columnar view, so the fleet arrays are
+    # swept while hot instead of once per concern.
+    cols = _hospitals_to_arrays(hospitals)
+    safe = _safe_denominators(cols)
+    pressures = _network_pressures(cols, safe)
+
+    critical_mask = pressures > 90
+    statuses = np.select(
+        [critical_mask, pressures > pressure_threshold, pressures > 50],
+        ["critical", "overloaded", "stable"],
+        default="available",
+    )
+    priorities = np.select(
+        [critical_mask, pressures > 80],
+        ["critical", "high"],
+        default="medium",
+    )
 
-    # Step 2: Identify senders and receivers
-    senders = [h for h in hospital_metrics if h["pressure"] > pressure_threshold]
-    receivers = [h for h in hospital_metrics if h["available"]["beds"] >= min_receiving_capacity and h["pressure"] < pressure_threshold]
+    avail_beds = np.maximum(cols["total_beds"] - cols["occupied_beds"], 0).astype(np.int64)
+    avail_icu = np.maximum(cols["icu_beds"] - cols["occupied_icu"], 0).astype(np.int64)
+    avail_staff = np.maximum(cols["total_staff"] - cols["active_staff"], 0).astype(np.int64)
+
+    # Excess is deliberately unclamped: a sender with negative bed excess
+    # but positive ICU excess is still a valid sender
+    excess_beds = (cols["occupied_beds"] - (cols["total_beds"] * 0.75).astype(np.int64)).astype(np.int64)
+    excess_icu = (cols["occupied_icu"] - (cols["icu_beds"] * 0.75).astype(np.int64)).astype(np.int64)
+
+    sender_indices = np.where(pressures > pressure_threshold)[0]
+    receiver_indices = np.where(
+        (avail_beds >= min_receiving_capacity) & (pressures < pressure_threshold)
+    )[0]
+
+    total_pressure = pressures.mean()
+    critical_count = int(np.count_nonzero(critical_mask))
+    overloaded_count = int(np.count_nonzero((pressures > 75) & (pressures <= 90)))
+
+    # Sort senders by pressure (most critical first) and receivers by
+    # available capacity (most capacity first). Stable argsort keeps the
+    # original index order on ties, like the Python list sort it replaces.
+    # Senders are not truncated to max_transfers here: a sender can yield
+    # zero accepted transfers, so later senders may still get budget.
+    sender_ids = sender_indices[np.argsort(-pressures[sender_indices], kind="stable")]
+    r_idxs = receiver_indices[np.argsort(-avail_beds[receiver_indices], kind="stable")]
+
+    # Senders with nothing to shed are dropped up front, so the kernel
+    # never spends an iteration on them
+    sender_ids = sender_ids[(excess_beds[sender_ids] > 0) | (excess_icu[sender_ids] > 0)]
+
+    dist_matrix, name_to_idx = _build_distance_matrix(
+        tuple((h["name"], h["region"]) for h in hospitals)
+    )
 
-    # Sort senders by pressure (most critical first)
-    senders.sort(key=lambda x: x["pressure"], reverse=True)
-    # Sort receivers by available capacity (most capacity first)
-    receivers.sort(key=lambda x: x["available"]["beds"], reverse=True)
+    # Step 3: Generate transfer recommendations. The matching itself runs in
+    # the array-only kernel; the loop below just dresses the accepted
+    # matches up as result dicts.
+    matches = _match_transfers(
+        sender_ids, excess_beds, excess_icu,
+        r_idxs, avail_beds, avail_icu, avail_staff,
+        dist_matrix, max_transfers,
+    )
 
-    distances = generate_distance_matrix(hospitals)
+    # Estimate impact with the closed-form delta: only the bed and ICU
+    # terms of the pressure formula change, so the vent/staff terms cancel
+    # and each transfer costs two divisions. live_pressures chains the
+    # reductions, so a sender's second transfer starts from its already
+    # reduced pressure instead of re-claiming the full original reduction;
+    # the pristine pressures array still backs status and summary output.
+    live_pressures = pressures.copy()
+
+    # Distances, travel times and match scores for all accepted transfers
+    # rounded in three array ops, instead of per-scalar round() in the loop.
+    # The chained pressure update below stays scalar — each iteration
+    # depends on the previous one.
+    m_dists = dist_matrix[matches["sender"], matches["receiver"]]
+    m_times = np.round(m_dists * 1.5 + 15, 0)
+    m_scores = np.round(matches["score"], 1)
 
-    # Step 3: Generate transfer recommendations
     transfers = []
-    transfer_count = 0
-
-    for sender in senders:
-        if transfer_count >= max_transfers:
-            break
-
-        excess_beds = sender["occupied_beds"] - int(sender["total_beds"] * 0.75)
-        excess_icu = sender["occupied_icu"] - int(sender["icu_beds"] * 0.75)
-
-        if excess_beds <= 0 and excess_icu <= 0:
-            continue
-
-        # Score each receiver for this sender
-        receiver_scores = []
-        for receiver in receivers:
-            if receiver["name"] == sender["name"]:
-                continue
-
-            dist = distances.get(sender["name"], {}).get(receiver["name"], 50.0)
-            capacity_score = (
-                receiver["available"]["beds"] * 2 +
-                receiver["available"]["icu"] * 5 +
-                receiver["available"]["staff_slack"] * 1
-            )
-            distance_penalty = dist * 0.5
-            score = capacity_score - distance_penalty
-
-            receiver_scores.append({
-                "receiver": receiver,
-                "distance": dist,
-                "score": round(score, 1),
-            })
-
-        receiver_scores.sort(key=lambda x: x["score"], reverse=True)
-
-        for scored in receiver_scores[:3]:  # Top 3 receivers per sender
-            if transfer_count >= max_transfers:
-                break
-
-            receiver = scored["receiver"]
-            # Calculate how many patients to transfer
-            transferable_beds = min(excess_beds, receiver["available"]["beds"], 15)
-            transferable_icu = min(max(0, excess_icu), receiver["available"]["icu"], 5)
-
-            if transferable_beds <= 0 and transferable_icu <= 0:
-                continue
+    for t_id, m in enumerate(matches, start=1):
+        s_idx = int(m["sender"])
+        t_idx = int(m["receiver"])
+        transferable_beds = int(m["beds"])
+        transferable_icu = int(m["icu"])
+        sender = hospitals[s_idx]
+        receiver = hospitals[t_idx]
+
+        pressure_before = float(live_pressures[s_idx])
+        dp = (
+            transferable_beds / safe["total_beds"][s_idx] * 25.0 +
+            transferable_icu / safe["icu_beds"][s_idx] * 35.0
+        )
+        sender_new_pressure = round(max(0.0, pressure_before - dp), 1)
+        live_pressures[s_idx] = sender_new_pressure
+
+        transfers.append({
+            "id": t_id,
+            "priority": str(priorities[s_idx]),
+            "from_hospital": sender["name"],
+            "from_region": sender["region"],
+            "from_pressure": pressure_before,
+            "to_hospital": receiver["name"],
+            "to_region": receiver["region"],
+            "to_pressure": float(pressures[t_idx]),
+            "distance_km": float(m_dists[t_id - 1]),
+            "patients_general": transferable_beds,
+            "patients_icu": transferable_icu,
+            "total_patients": transferable_beds + transferable_icu,
+            "estimated_transfer_time_min": float(m_times[t_id - 1]),
+            "sender_pressure_after": sender_new_pressure,
+            "pressure_reduction": round(pressure_before - sender_new_pressure, 1),
+            "match_score": float(m_scores[t_id - 1]),
+        })
 
-            # Estimate impact
-            sender_new_pressure = calculate_hospital_pressure({
-                **sender,
-                "occupied_beds": sender["occupied_beds"] - transferable_beds,
-                "occupied_icu": sender["occupied_icu"] - transferable_icu,
-            })
-
-            transfers.append({
-                "id": transfer_count + 1,
-                "priority": "critical" if sender["pressure"] > 90 else "high" if sender["pressure"] > 80 else "medium",
-                "from_hospital": sender["name"],
-                "from_region": sender["region"],
-                "from_pressure": sender["pressure"],
-                "to_hospital": receiver["name"],
-                "to_region": receiver["region"],
-                "to_pressure": receiver["pressure"],
-                "distance_km": scored["distance"],
-                "patients_general": max(0, transferable_beds),
-                "patients_icu": max(0, transferable_icu),
-                "total_patients": max(0, transferable_beds) + max(0, transferable_icu),
-                "estimated_transfer_time_min": round(scored["distance"] * 1.5 + 15, 0),
-                "sender_pressure_after": sender_new_pressure,
-                "pressure_reduction": round(sender["pressure"] - sender_new_pressure, 1),
-                "match_score": scored["score"],
-            })
-
-            # Update receiver capacity
-            receiver["available"]["beds"] -= max(0, transferable_beds)
-            receiver["available"]["icu"] -= max(0, transferable_icu)
-            transfer_count += 1
-
-    # Step 4: Build network summary
-    total_pressure = np.mean([h["pressure"] for h in hospital_metrics])
-    critical_count = sum(1 for h in hospital_metrics if h["pressure"] > 90)
-    overloaded_count = sum(1 for h in hospital_metrics if 75 < h["pressure"] <= 90)
-
-    # Estimate post-transfer network pressure
+    # Step 4: Build network summary from the scalars computed in the fused
+    # block above. Estimate post-transfer network pressure
     post_pressure = total_pressure
     if transfers:
         total_reduction = sum(t["pressure_reduction"] for t in transfers)
-        post_pressure = max(0, total_pressure - total_reduction / len(hospital_metrics))
+        post_pressure = max(0, total_pressure - total_reduction / len(hospitals))
 
     return {
         "network_summary": {
@@ -198,12 +365,12 @@ def recommend_transfers(
             {
                 "name": h["name"],
                 "region": h["region"],
-                "pressure": h["pressure"],
-                "status": h["status"],
-                "available_beds": h["available"]["beds"],
-                "available_icu": h["available"]["icu"],
+                "pressure": float(pressures[i]),
+                "status": str(statuses[i]),
+                "available_beds": int(avail_beds[i]),
+                "available_icu": int(avail_icu[i]),
             }
-            for h in hospital_metrics
+            for i, h in enumerate(hospitals)
         ],
         "recommended_transfers": transfers,
         "total_patients_to_transfer": sum(t["total_patients"] for t in transfers),